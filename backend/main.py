@@ -1,20 +1,30 @@
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse
 from pymongo import MongoClient
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from services.chatbot import ask_question
+from services.thumbnails import get_thumbnail, thumbnail_version
 
 # --- INITIALIZATION ---
 load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
+HOT_WINDOW_DAYS = int(os.getenv("HOT_WINDOW_DAYS", "7"))
 
 app = FastAPI(title="AI News Aggregator API")
 client = MongoClient(MONGO_URI)
 db = client.news_db
-collection = db.articles
+collection = db.articles          # Hot tier: recent articles with embeddings
+archive = db.articles_archive     # Cold tier: every article, without embeddings
+
+# Fields returned for each highlight card; full_text and embeddings are served separately
+CARD_FIELDS = ["title", "summary", "source", "authors", "category", "published_date", "image_url", "article_url"]
+THUMBNAIL_CACHE_SECONDS = 30 * 24 * 60 * 60
 
 # Allow the frontend to communicate with this backend
 app.add_middleware(
@@ -31,31 +41,54 @@ class ChatRequest(BaseModel):
 
 # --- API ENDPOINTS ---
 @app.get("/highlights")
-def get_highlights():
+def get_highlights(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50),
+    category: str | None = None,
+):
     """
-    Finds top story clusters for EACH category from the last 24 hours.
+    Finds top story clusters for EACH category, one page of slim cards at a time.
     """
     categories = ["sports", "lifestyle", "music", "finance", "general news"]
+    if category is not None:
+        if category not in categories:
+            raise HTTPException(status_code=404, detail=f"Unknown category: {category}")
+        categories = [category]
     highlights = {category: [] for category in categories}
-    
+
+    # The TTL monitor only runs periodically, so expired articles are filtered explicitly
+    cutoff = datetime.utcnow() - timedelta(days=HOT_WINDOW_DAYS)
+    first_rank = (page - 1) * page_size + 1
+    last_rank = page * page_size
+
+    # Stories are grouped and ranked over all categories before filtering, so a page
+    # is identical whether it was requested for one category or for all of them
     pipeline = [
-        {"$match": {"cluster_id": {"$ne": -1}}},        # 1. Filter for articles in a cluster
-        {"$sort": {"published_date": -1}},              # 2. Sort by date to get the newest representative
+        {"$match": {                                    # 1. Filter for recent articles in a cluster
+            "published_date": {"$gte": cutoff},
+            "cluster_id": {"$ne": -1},
+        }},
+        {"$project": {field: 1 for field in CARD_FIELDS + ["cluster_id"]}},       # 2. Drop full_text and embeddings early
+        {"$sort": {"published_date": -1, "_id": 1}},    # 3. Sort by date to get the newest representative
         {
-            "$group": {                                 # 3. Group by story to calculate frequency
+            "$group": {                                 # 4. Group by story to calculate frequency
                 "_id": "$cluster_id",
                 "frequency": {"$sum": 1},
                 "representative_article": {"$first": "$$ROOT"},
             }
         },
         {
-            "$setWindowFields": {                       # 4. Rank stories within each category
+            "$setWindowFields": {                       # 5. Number stories within each category
                 "partitionBy": "$representative_article.category",
-                "sortBy": {"frequency": -1},
-                "output": {"rank_in_category": {"$rank": {}}},
+                "sortBy": {"frequency": -1, "_id": 1},
+                "output": {"rank_in_category": {"$documentNumber": {}}},
             }
         },
-        {"$match": {"rank_in_category": {"$lte": 10}}}, # 5. Keep only the top 10 from each category
+        {"$match": {                                    # 6. Keep only the requested categories and page
+            "representative_article.category": {"$in": categories},
+            "rank_in_category": {"$gte": first_rank, "$lte": last_rank},
+        }},
+        {"$sort": {"rank_in_category": 1}},
     ]
     
     top_stories = list(collection.aggregate(pipeline))
@@ -72,10 +105,92 @@ def get_highlights():
                     article[key] = None
 
             article['frequency'] = story['frequency']
+            article['thumbnail_url'] = thumbnail_url(article)
             highlights[category].append(article)
         
     return highlights
 
+def thumbnail_url(article: dict):
+    """
+    Builds the thumbnail URL for an article card. The image hash is included so
+    clients fetch a fresh thumbnail whenever the article's image changes.
+    """
+    image_url = article.get('image_url')
+    if not isinstance(image_url, str) or not image_url:
+        return None
+    return f"/thumbnails/{article['_id']}?v={thumbnail_version(image_url)[:16]}"
+
+def find_article(article_id: str, projection: dict):
+    """Looks up a single article by its id in the hot tier, then the archive, raising a 404 if it does not exist."""
+    try:
+        object_id = ObjectId(article_id)
+    except InvalidId:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    article = collection.find_one({"_id": object_id}, projection)
+    if article is None:
+        article = archive.find_one({"_id": object_id}, projection)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return article
+
+@app.get("/articles/{article_id}")
+def get_article(article_id: str):
+    """Returns the full text of a single article, fetched when the reader opens it."""
+    article = find_article(article_id, {"title": 1, "full_text": 1})
+    full_text = article.get("full_text")
+    if isinstance(full_text, float) and full_text != full_text:
+        full_text = None
+    return {"_id": article_id, "title": article.get("title"), "full_text": full_text}
+
+@app.get("/thumbnails/{article_id}")
+def get_article_thumbnail(article_id: str, v: str | None = None):
+    """
+    Serves a resized, locally cached copy of an article's image. The 'v' parameter
+    only versions the URL for client caches; the current image is always served.
+    """
+    article = find_article(article_id, {"image_url": 1})
+    image_url = article.get("image_url")
+    path = get_thumbnail(image_url) if isinstance(image_url, str) and image_url else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": f"public, max-age={THUMBNAIL_CACHE_SECONDS}, immutable"},
+    )
+
+@app.get("/archive/search")
+def search_archive(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50),
+):
+    """
+    Opt-in keyword search over the cold archive of older articles.
+    """
+    cursor = (
+        archive.find(
+            {"$text": {"$search": q}},
+            {**{field: 1 for field in CARD_FIELDS}, "score": {"$meta": "textScore"}},
+        )
+        .sort([("score", {"$meta": "textScore"}), ("published_date", -1)])
+        .skip((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+    results = []
+    for article in cursor:
+        article['_id'] = str(article['_id'])
+        article.pop('score', None)
+        for key, value in article.items():
+            if isinstance(value, float) and value != value:
+                article[key] = None
+        article['thumbnail_url'] = thumbnail_url(article)
+        results.append(article)
+
+    return {"query": q, "page": page, "results": results}
+
 @app.post("/chatbot/ask")
 def handle_chat_query(request: ChatRequest):
     """Endpoint to handle chatbot questions."""
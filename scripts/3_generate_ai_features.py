@@ -60,7 +60,7 @@ def main():
     output_path = data_dir / "enriched_news.pkl"
 
     print("Step 1: Loading cleaned data...")
-    df = pd.read_csv(input_path)
+    df = pd.read_csv(input_path, parse_dates=['published_date'])
     df['text_for_ai'] = df['title'] + ". " + df['summary'].fillna('')
 
     print("Step 2: Starting AI feature generation...")
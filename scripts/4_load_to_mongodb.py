@@ -1,9 +1,138 @@
 import os
 import pandas as pd
+from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
-from pymongo import MongoClient, operations
-from pymongo.errors import BulkWriteError
+from bson import ObjectId
+from pymongo import MongoClient, operations, ASCENDING, TEXT
+from pymongo.errors import BulkWriteError, OperationFailure
+
+# Fields dropped from documents when they move to the cold archive
+ARCHIVE_EXCLUDED_FIELDS = ["embedding"]
+
+def parse_published_date(value):
+    """Converts a published date (string, Timestamp or datetime) into a naive UTC datetime."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.to_pydatetime()
+
+def to_archive_record(rec):
+    """Returns a compact copy of an article for the cold archive, without embeddings."""
+    return {key: value for key, value in rec.items() if key not in ARCHIVE_EXCLUDED_FIELDS and key != "_id"}
+
+def split_records(records, cutoff):
+    """Splits records into compact archive copies of every article and the recent articles for the hot tier."""
+    archive_records = [to_archive_record(rec) for rec in records]
+    hot_records = [rec for rec in records if rec["published_date"] >= cutoff]
+    return archive_records, hot_records
+
+def convert_string_dates(target):
+    """One-time fix for documents loaded before published_date was stored as a BSON Date."""
+    bulk_operations = []
+    for doc in target.find({"published_date": {"$type": "string"}}, {"published_date": 1}):
+        try:
+            published_date = parse_published_date(doc["published_date"])
+        except ValueError:
+            continue
+        bulk_operations.append(operations.UpdateOne({"_id": doc["_id"]}, {"$set": {"published_date": published_date}}))
+    if bulk_operations:
+        target.bulk_write(bulk_operations)
+    return len(bulk_operations)
+
+def assign_article_ids(records, collection, archive):
+    """
+    Maps each article URL to the _id it already has in either tier, or a new one,
+    so an article keeps the same _id in the hot tier and the archive.
+    """
+    urls = [rec["article_url"] for rec in records]
+    article_ids = {}
+    for target in (archive, collection):
+        for doc in target.find({"article_url": {"$in": urls}}, {"article_url": 1}):
+            article_ids.setdefault(doc["article_url"], doc["_id"])
+    for url in urls:
+        article_ids.setdefault(url, ObjectId())
+    return article_ids
+
+def upsert_operations(records, article_ids):
+    """Builds upserts keyed by 'article_url' that reuse the article's shared _id when inserting."""
+    return [
+        operations.UpdateOne(
+            {"article_url": rec["article_url"]},
+            {"$set": rec, "$setOnInsert": {"_id": article_ids[rec["article_url"]]}},
+            upsert=True
+        )
+        for rec in records
+    ]
+
+def load_records(collection, archive, records, cutoff):
+    """
+    Writes every record to the archive and the recent ones to the hot tier.
+    The archive is written first, and a failure there raises before the hot tier
+    is touched, so nothing can expire from the hot tier without an archived copy.
+    """
+    article_ids = assign_article_ids(records, collection, archive)
+    archive_records, hot_records = split_records(records, cutoff)
+
+    archive_result = archive.bulk_write(upsert_operations(archive_records, article_ids))
+    hot_result = collection.bulk_write(upsert_operations(hot_records, article_ids)) if hot_records else None
+    return archive_result, hot_result
+
+def archive_upserts(docs):
+    """Builds archive upserts for hot documents that keep each document's _id."""
+    return [
+        operations.UpdateOne(
+            {"article_url": doc["article_url"]},
+            {"$set": to_archive_record(doc), "$setOnInsert": {"_id": doc["_id"]}},
+            upsert=True
+        )
+        for doc in docs
+    ]
+
+def backfill_archive(collection, archive):
+    """Copies hot articles with no archive copy yet, such as those loaded before tiering, into the archive."""
+    hot_urls = [doc["article_url"] for doc in collection.find({}, {"article_url": 1})]
+    archived_urls = {doc["article_url"] for doc in archive.find({"article_url": {"$in": hot_urls}}, {"article_url": 1})}
+    missing_urls = [url for url in hot_urls if url not in archived_urls]
+    if not missing_urls:
+        return 0
+    missing = list(collection.find({"article_url": {"$in": missing_urls}}, {"embedding": 0}))
+    archive.bulk_write(archive_upserts(missing))
+    return len(missing)
+
+def archive_expired_articles(collection, archive, cutoff):
+    """Copies hot articles older than the cutoff into the archive and removes them from the hot tier."""
+    expired = list(collection.find({"published_date": {"$lt": cutoff}}, {"embedding": 0}))
+    if not expired:
+        return 0
+    archive.bulk_write(archive_upserts(expired))
+    collection.delete_many({"_id": {"$in": [doc["_id"] for doc in expired]}})
+    return len(expired)
+
+def archive_hot_tier(collection, archive, cutoff):
+    """
+    Ensures every hot article has an archive copy, then moves expired ones out of
+    the hot tier. This must run before the TTL index is created, so the TTL
+    monitor only ever deletes articles that are already archived.
+    """
+    backfilled_count = backfill_archive(collection, archive)
+    archived_count = archive_expired_articles(collection, archive, cutoff)
+    return backfilled_count, archived_count
+
+def ensure_indexes(db, collection, archive, hot_window_days):
+    """Creates the TTL index that expires hot articles and the archive's search indexes."""
+    expire_after = hot_window_days * 24 * 60 * 60
+    try:
+        collection.create_index([("published_date", ASCENDING)], name="published_date_ttl", expireAfterSeconds=expire_after)
+    except OperationFailure as e:
+        # The index already exists with a different window, so update it in place
+        if e.code != 85:
+            raise
+        db.command("collMod", collection.name, index={"name": "published_date_ttl", "expireAfterSeconds": expire_after})
+
+    archive.create_index([("article_url", ASCENDING)], unique=True)
+    archive.create_index([("published_date", ASCENDING)])
+    archive.create_index([("title", TEXT), ("summary", TEXT)], name="archive_text")
 
 def main():
     """Main function to load enriched data into MongoDB."""
@@ -14,9 +143,13 @@ def main():
     if not mongo_uri:
         raise ValueError("MONGO_URI not found in .env file.")
 
+    hot_window_days = int(os.getenv("HOT_WINDOW_DAYS", "7"))
+    cutoff = datetime.utcnow() - timedelta(days=hot_window_days)
+
     client = MongoClient(mongo_uri)
     db = client.news_db
     collection = db.articles
+    archive = db.articles_archive
     
     print("Successfully connected to MongoDB.")
 
@@ -27,33 +160,46 @@ def main():
     df = pd.read_pickle(input_path)
     # Convert dataframe to a list of dictionaries for insertion
     records = df.to_dict('records')
+    # Dates arrive as strings after the CSV round-trip in step 2, so store them as
+    # BSON Dates for the hot window filter and the TTL index
+    for rec in records:
+        rec["published_date"] = parse_published_date(rec["published_date"])
     print(f"Loaded {len(records)} records.")
 
-    # --- 3. Prepare and Execute Bulk Upsert ---
-    print("Step 3: Preparing and executing bulk upsert operation...")
+    # --- 3. Move Expired Articles to the Archive ---
+    # This must run before the TTL index is created, otherwise hot articles
+    # could be deleted by the TTL monitor before they reach the archive.
+    print(f"Step 3: Archiving articles older than {hot_window_days} days...")
+    converted_count = convert_string_dates(collection) + convert_string_dates(archive)
+    print(f"Converted {converted_count} string dates to BSON Dates.")
+    backfilled_count, archived_count = archive_hot_tier(collection, archive, cutoff)
+    ensure_indexes(db, collection, archive, hot_window_days)
+    print(f"Backfilled {backfilled_count} hot articles into the archive.")
+    print(f"Archived {archived_count} expired articles.")
+
+    # --- 4. Execute Bulk Upserts ---
+    print("Step 4: Executing bulk upsert operations...")
     # Using 'upsert=True' to insert a document if it doesn't exist,
     # or update it if it does, based on the 'article_url'.
-    bulk_operations = [
-        operations.UpdateOne(
-            {"article_url": rec["article_url"]},
-            {"$set": rec},
-            upsert=True
-        )
-        for rec in records
-    ]
-    
-    if not bulk_operations:
+    # Every article is written to the archive; only recent ones enter the hot tier.
+    if not records:
         print("No records to upsert.")
         return
 
     try:
-        result = collection.bulk_write(bulk_operations)
-        print("\nBulk write operation complete.")
-        print(f"  - Documents inserted: {result.upserted_count}")
-        print(f"  - Documents modified: {result.modified_count}")
+        archive_result, hot_result = load_records(collection, archive, records, cutoff)
     except BulkWriteError as bwe:
         print("\nAn error occurred during bulk write:")
         print(bwe.details)
+        return
+
+    for name, result in [("Archive", archive_result), ("Hot", hot_result)]:
+        if result is None:
+            print(f"\n{name} tier: no records to upsert.")
+            continue
+        print(f"\n{name} tier bulk write operation complete.")
+        print(f"  - Documents inserted: {result.upserted_count}")
+        print(f"  - Documents modified: {result.modified_count}")
     
     print("Data loading process finished.")
 
@@ -19,7 +19,7 @@ if not MONGO_URI or not GOOGLE_API_KEY:
 # 1. Initialize MongoDB Connection
 client = MongoClient(MONGO_URI)
 db = client.news_db
-collection = db.articles
+collection = db.articles # Hot tier only; older articles are archived without embeddings
 
 # 2. Initialize the Embedding Model (must be the same as in the generation script)
 # This model runs locally and is used to convert the user's question into a vector.
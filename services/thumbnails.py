@@ -0,0 +1,146 @@
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+import requests
+from PIL import Image
+
+# --- CONFIGURATION ---
+# Thumbnails are stored on local disk, keyed by a hash of the source image URL,
+# so each remote image is fetched and resized only once.
+THUMBNAIL_CACHE_DIR = Path(
+    os.getenv("THUMBNAIL_CACHE_DIR", Path(__file__).resolve().parents[1] / "data" / "thumbnails")
+)
+THUMBNAIL_CACHE_MAX_BYTES = int(os.getenv("THUMBNAIL_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+THUMBNAIL_MAX_SIZE = (400, 300)
+THUMBNAIL_QUALITY = 80
+FETCH_TIMEOUT = 10
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+FAILURE_RETRY_SECONDS = 24 * 60 * 60 # How long a broken image (4xx, undecodable, oversized) is remembered
+TRANSIENT_RETRY_SECONDS = 5 * 60     # How long a timeout or server error is remembered before retrying
+PRUNE_TARGET_RATIO = 0.9             # Pruning frees space below the cap so it doesn't run on every write
+
+_cache_lock = threading.Lock()
+_cache_bytes = None # Running total of thumbnail bytes on disk, initialised by the first scan
+
+def thumbnail_version(image_url: str) -> str:
+    """Returns a hash of the image URL, used as the thumbnail cache key and version."""
+    return hashlib.sha256(image_url.encode("utf-8")).hexdigest()
+
+def thumbnail_path(image_url: str) -> Path:
+    """Returns the on-disk location of the cached thumbnail for an image URL."""
+    return THUMBNAIL_CACHE_DIR / f"{thumbnail_version(image_url)}.jpg"
+
+def make_thumbnail(image_bytes: bytes) -> bytes:
+    """Resizes raw image bytes into a compact JPEG thumbnail."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # Animated GIFs and transparent PNGs are flattened to their first RGB frame
+        image = image.convert("RGB")
+        image.thumbnail(THUMBNAIL_MAX_SIZE)
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return output.getvalue()
+
+def download_image(image_url: str) -> bytes:
+    """Downloads a remote image, raising ValueError if it is larger than MAX_IMAGE_BYTES."""
+    with requests.get(image_url, timeout=FETCH_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        if int(response.headers.get("Content-Length") or 0) > MAX_IMAGE_BYTES:
+            raise ValueError(f"Image larger than {MAX_IMAGE_BYTES} bytes")
+
+        content = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            content.extend(chunk)
+            if len(content) > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image larger than {MAX_IMAGE_BYTES} bytes")
+    return bytes(content)
+
+def write_atomically(path: Path, data: bytes):
+    """Writes to a temporary file first so concurrent requests never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+def scan_cache():
+    """Returns (mtime, size, path) for every cached thumbnail, ignoring in-progress temporary files."""
+    entries = []
+    for path in THUMBNAIL_CACHE_DIR.glob("*.jpg"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+def prune_cache(max_bytes: int = None):
+    """Deletes the least recently used thumbnails until the cache fits within max_bytes."""
+    global _cache_bytes
+    max_bytes = int(THUMBNAIL_CACHE_MAX_BYTES * PRUNE_TARGET_RATIO) if max_bytes is None else max_bytes
+    with _cache_lock:
+        entries = scan_cache()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        _cache_bytes = total
+
+def record_cache_write(size: int):
+    """Adds a new thumbnail to the running cache total, pruning only once it exceeds the cap."""
+    global _cache_bytes
+    with _cache_lock:
+        if _cache_bytes is None:
+            _cache_bytes = sum(size for _, size, _ in scan_cache())
+        else:
+            _cache_bytes += size
+        over_cap = _cache_bytes > THUMBNAIL_CACHE_MAX_BYTES
+    if over_cap:
+        prune_cache()
+
+def failure_retry_seconds(error: Exception) -> int:
+    """Returns how long a failed image URL should be remembered before it is fetched again."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code if error.response is not None else 500
+        if 400 <= status < 500 and status not in (408, 429):
+            return FAILURE_RETRY_SECONDS
+        return TRANSIENT_RETRY_SECONDS
+    if isinstance(error, requests.exceptions.RequestException):
+        return TRANSIENT_RETRY_SECONDS # Timeouts and connection errors
+    return FAILURE_RETRY_SECONDS # Oversized or undecodable images
+
+def get_thumbnail(image_url: str):
+    """
+    Returns the path of the cached thumbnail for an image URL, fetching and
+    resizing the remote image on first use. Returns None if the image is unavailable.
+    """
+    path = thumbnail_path(image_url)
+    try:
+        os.utime(path) # Mark as recently used so pruning evicts colder thumbnails first
+        return path
+    except FileNotFoundError:
+        pass
+
+    # Failed URLs are remembered until the expiry time stored in the marker,
+    # so dead links aren't refetched on every request
+    failed_marker = path.with_suffix(".failed")
+    try:
+        if float(failed_marker.read_text()) > time.time():
+            return None
+    except (FileNotFoundError, ValueError):
+        pass
+
+    try:
+        thumbnail = make_thumbnail(download_image(image_url))
+    except (requests.exceptions.RequestException, OSError, ValueError, Image.DecompressionBombError) as e:
+        write_atomically(failed_marker, str(time.time() + failure_retry_seconds(e)).encode())
+        return None
+
+    write_atomically(path, thumbnail)
+    failed_marker.unlink(missing_ok=True)
+    record_cache_write(len(thumbnail))
+    return path
@@ -18,4 +18,59 @@ def test_highlights_endpoint():
         assert isinstance(data, dict) # The response should be a dictionary
         if data:
             first_value = next(iter(data.values()))
-            assert isinstance(first_value, list)
\ No newline at end of file
+            assert isinstance(first_value, list)
+
+@pytest.mark.integration
+def test_highlights_pagination():
+    """Tests that /highlights returns slim, paginated cards without full text."""
+    with httpx.Client() as client:
+        response = client.get(f"{BASE_URL}/highlights", params={"page": 1, "page_size": 2})
+        assert response.status_code == 200
+        data = response.json()
+
+        for articles in data.values():
+            assert len(articles) <= 2
+            for article in articles:
+                assert "full_text" not in article
+                assert "embedding" not in article
+
+@pytest.mark.integration
+def test_highlights_pages_match_across_calls():
+    """Tests that paging through one category matches paging through all categories."""
+    with httpx.Client() as client:
+        def page(number, **params):
+            response = client.get(f"{BASE_URL}/highlights", params={"page": number, "page_size": 2, **params})
+            assert response.status_code == 200
+            return response.json()
+
+        all_pages = [page(1), page(2)]
+        for category in all_pages[0]:
+            from_all = [article["_id"] for data in all_pages for article in data[category]]
+            from_category = [article["_id"] for number in (1, 2) for article in page(number, category=category)[category]]
+            assert from_all == from_category
+            assert len(from_all) == len(set(from_all))
+
+@pytest.mark.integration
+def test_article_endpoint():
+    """Tests that /articles/{id} serves full text and rejects unknown ids."""
+    with httpx.Client() as client:
+        assert client.get(f"{BASE_URL}/articles/not-an-id").status_code == 404
+
+        data = client.get(f"{BASE_URL}/highlights", params={"page_size": 1}).json()
+        articles = [article for articles in data.values() for article in articles]
+        if articles:
+            response = client.get(f"{BASE_URL}/articles/{articles[0]['_id']}")
+            assert response.status_code == 200
+            assert "full_text" in response.json()
+
+@pytest.mark.integration
+def test_archive_search_endpoint():
+    """Tests that /archive/search returns compact results without embeddings."""
+    with httpx.Client() as client:
+        response = client.get(f"{BASE_URL}/archive/search", params={"q": "news", "page_size": 3})
+        assert response.status_code == 200
+        data = response.json()
+
+        assert len(data["results"]) <= 3
+        for article in data["results"]:
+            assert "embedding" not in article
@@ -0,0 +1,141 @@
+import importlib
+import io
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+import pandas as pd
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+# Add the project root to the path to allow imports from 'scripts'
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+loader = importlib.import_module("scripts.4_load_to_mongodb")
+
+CUTOFF = datetime(2025, 10, 1)
+
+class StubCollection:
+    """In-memory stand-in for the small subset of the pymongo Collection API the loader uses."""
+    def __init__(self, docs=None, fail_writes=False):
+        self.docs = [dict(doc) for doc in docs or []]
+        self.fail_writes = fail_writes
+
+    @staticmethod
+    def _matches(doc, query):
+        for field, condition in query.items():
+            value = doc.get(field)
+            if "$lt" in condition and not (isinstance(value, datetime) and value < condition["$lt"]):
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if condition.get("$type") == "string" and not isinstance(value, str):
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        return [dict(doc) for doc in self.docs if self._matches(doc, query)]
+
+    def bulk_write(self, ops):
+        if self.fail_writes:
+            raise BulkWriteError({"writeErrors": [{"index": 0}]})
+        for op in ops:
+            ((key, value),) = op._filter.items()
+            existing = next((doc for doc in self.docs if doc.get(key) == value), None)
+            if existing is None:
+                existing = {key: value, **op._doc.get("$setOnInsert", {})}
+                existing.setdefault("_id", ObjectId())
+                self.docs.append(existing)
+            existing.update(op._doc["$set"])
+
+    def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if doc["_id"] not in query["_id"]["$in"]]
+
+def make_record(url, published_date):
+    return {"article_url": url, "title": url, "published_date": published_date, "embedding": [0.1, 0.2]}
+
+def test_to_archive_record_strips_embedding():
+    """Tests that archive copies drop the embedding and _id but keep the article."""
+    record = {"_id": ObjectId(), **make_record("a", CUTOFF)}
+    archived = loader.to_archive_record(record)
+
+    assert "embedding" not in archived
+    assert "_id" not in archived
+    assert archived["article_url"] == "a"
+
+def test_old_records_go_to_archive_only():
+    """Tests that every record is archived while only recent ones reach the hot tier."""
+    hot, archive = StubCollection(), StubCollection()
+    records = [make_record("old", CUTOFF - timedelta(days=1)), make_record("new", CUTOFF + timedelta(days=1))]
+
+    loader.load_records(hot, archive, records, CUTOFF)
+
+    assert [doc["article_url"] for doc in hot.docs] == ["new"]
+    assert sorted(doc["article_url"] for doc in archive.docs) == ["new", "old"]
+    assert all("embedding" not in doc for doc in archive.docs)
+    assert hot.docs[0]["_id"] == next(doc["_id"] for doc in archive.docs if doc["article_url"] == "new")
+
+def test_archive_failure_leaves_hot_tier_untouched():
+    """Tests that a failed archive write stops the hot tier write."""
+    hot, archive = StubCollection(), StubCollection(fail_writes=True)
+
+    with pytest.raises(BulkWriteError):
+        loader.load_records(hot, archive, [make_record("new", CUTOFF + timedelta(days=1))], CUTOFF)
+
+    assert hot.docs == []
+
+def test_archive_expired_articles_moves_and_deletes():
+    """Tests that expired hot articles are archived under the same _id and removed from the hot tier."""
+    old_id, new_id = ObjectId(), ObjectId()
+    hot = StubCollection([
+        {"_id": old_id, **make_record("old", CUTOFF - timedelta(days=1))},
+        {"_id": new_id, **make_record("new", CUTOFF + timedelta(days=1))},
+    ])
+    archive = StubCollection()
+
+    assert loader.archive_expired_articles(hot, archive, CUTOFF) == 1
+
+    assert [doc["_id"] for doc in hot.docs] == [new_id]
+    assert [doc["_id"] for doc in archive.docs] == [old_id]
+    assert "embedding" not in archive.docs[0]
+
+def test_dates_from_csv_round_trip_are_loaded():
+    """Tests that string dates from cleaned_news.csv are stored as datetimes and split by the window."""
+    df = pd.DataFrame([
+        {"article_url": "old", "title": "old", "published_date": pd.Timestamp("2025-09-20 08:00:00")},
+        {"article_url": "new", "title": "new", "published_date": pd.Timestamp("2025-10-03 00:07:57")},
+    ])
+    csv = io.StringIO()
+    df.to_csv(csv, index=False)
+    csv.seek(0)
+    records = pd.read_csv(csv).to_dict("records")
+    assert isinstance(records[0]["published_date"], str)
+
+    for rec in records:
+        rec["published_date"] = loader.parse_published_date(rec["published_date"])
+    hot, archive = StubCollection(), StubCollection()
+    loader.load_records(hot, archive, records, CUTOFF)
+
+    assert [doc["published_date"] for doc in hot.docs] == [datetime(2025, 10, 3, 0, 7, 57)]
+    assert len(archive.docs) == 2
+
+def test_convert_string_dates_updates_existing_documents():
+    """Tests the one-time conversion of string dates already stored in MongoDB."""
+    hot = StubCollection([{"_id": ObjectId(), "published_date": "2025-10-03T00:07:57+10:00"}])
+
+    assert loader.convert_string_dates(hot) == 1
+    assert hot.docs[0]["published_date"] == datetime(2025, 10, 2, 14, 7, 57)
+
+def test_archive_hot_tier_backfills_in_window_legacy_articles():
+    """Tests that hot articles loaded before tiering are archived before the TTL index can expire them."""
+    legacy_id, new_id = ObjectId(), ObjectId()
+    hot = StubCollection([
+        {"_id": legacy_id, **make_record("legacy", CUTOFF + timedelta(days=4))},
+        {"_id": new_id, **make_record("new", CUTOFF + timedelta(days=6))},
+    ])
+    archive = StubCollection([{"_id": new_id, **loader.to_archive_record(make_record("new", CUTOFF + timedelta(days=6)))}])
+
+    assert loader.archive_hot_tier(hot, archive, CUTOFF) == (1, 0)
+
+    assert sorted(doc["article_url"] for doc in hot.docs) == ["legacy", "new"]
+    assert {doc["article_url"]: doc["_id"] for doc in archive.docs} == {"legacy": legacy_id, "new": new_id}
+    assert all("embedding" not in doc for doc in archive.docs)
@@ -0,0 +1,158 @@
+import io
+import os
+import sys
+from pathlib import Path
+import pytest
+import requests
+from PIL import Image
+
+# Add the project root to the path to allow imports from 'services'
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import services.thumbnails as thumbnails
+from services.thumbnails import make_thumbnail, thumbnail_path, THUMBNAIL_MAX_SIZE
+
+IMAGE_URL = "https://example.com/image.png"
+
+def png_bytes(size=(800, 600)):
+    """Returns an in-memory PNG of the given size."""
+    output = io.BytesIO()
+    Image.new("RGB", size, (0, 128, 255)).save(output, format="PNG")
+    return output.getvalue()
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+    def __init__(self, content, headers=None, status_code=200):
+        self.content = content
+        self.headers = headers or {}
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Points the thumbnail cache at a temporary directory."""
+    monkeypatch.setattr(thumbnails, "THUMBNAIL_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(thumbnails, "_cache_bytes", None)
+    return tmp_path
+
+class FakeFetcher:
+    """Replacement for requests.get that records every URL fetched."""
+    def __init__(self):
+        self.calls = []
+        self.response = FakeResponse(png_bytes())
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return self.response
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Routes thumbnail downloads through a FakeFetcher."""
+    fetcher = FakeFetcher()
+    monkeypatch.setattr(thumbnails.requests, "get", fetcher.get)
+    return fetcher
+
+def test_make_thumbnail_resizes_to_jpeg():
+    """Tests that large images are shrunk to fit the thumbnail bounds as JPEG."""
+    original = io.BytesIO()
+    Image.new("RGBA", (1600, 900), (255, 0, 0, 128)).save(original, format="PNG")
+
+    thumbnail = Image.open(io.BytesIO(make_thumbnail(original.getvalue())))
+
+    assert thumbnail.format == "JPEG"
+    assert thumbnail.width <= THUMBNAIL_MAX_SIZE[0]
+    assert thumbnail.height <= THUMBNAIL_MAX_SIZE[1]
+
+def test_thumbnail_path_is_stable_per_url():
+    """Tests that the cache key depends only on the image URL."""
+    url = "https://example.com/image.jpg"
+    assert thumbnail_path(url) == thumbnail_path(url)
+    assert thumbnail_path(url) != thumbnail_path("https://example.com/other.jpg")
+
+def test_get_thumbnail_fetches_once(cache_dir, fetches):
+    """Tests that a remote image is fetched on first use and served from disk afterwards."""
+    path = thumbnails.get_thumbnail(IMAGE_URL)
+
+    assert path is not None and path.exists()
+    assert thumbnails.get_thumbnail(IMAGE_URL) == path
+    assert fetches.calls == [IMAGE_URL]
+
+def test_get_thumbnail_remembers_broken_images(cache_dir, fetches):
+    """Tests that an image URL returning a 4xx is not refetched on every request."""
+    fetches.response = FakeResponse(b"", status_code=404)
+
+    assert thumbnails.get_thumbnail(IMAGE_URL) is None
+    assert thumbnails.get_thumbnail(IMAGE_URL) is None
+    assert fetches.calls == [IMAGE_URL]
+
+def test_get_thumbnail_retries_transient_failures(cache_dir, fetches, monkeypatch):
+    """Tests that timeouts are only remembered briefly, so the image loads once the host recovers."""
+    monkeypatch.setattr(thumbnails, "TRANSIENT_RETRY_SECONDS", 0)
+    def failing_get(url, **kwargs):
+        fetches.calls.append(url)
+        raise requests.exceptions.Timeout("timed out")
+    monkeypatch.setattr(thumbnails.requests, "get", failing_get)
+
+    assert thumbnails.get_thumbnail(IMAGE_URL) is None
+    monkeypatch.setattr(thumbnails.requests, "get", fetches.get)
+    assert thumbnails.get_thumbnail(IMAGE_URL) is not None
+    assert fetches.calls == [IMAGE_URL, IMAGE_URL]
+
+def test_get_thumbnail_rejects_oversized_downloads(cache_dir, fetches, monkeypatch):
+    """Tests that downloads beyond the byte limit are abandoned."""
+    monkeypatch.setattr(thumbnails, "MAX_IMAGE_BYTES", 1024)
+    fetches.response = FakeResponse(png_bytes((2000, 2000)) + os.urandom(4096))
+
+    assert thumbnails.get_thumbnail(IMAGE_URL) is None
+
+def test_get_thumbnail_rejects_decompression_bombs(cache_dir, fetches, monkeypatch):
+    """Tests that images with huge pixel counts are rejected instead of raising."""
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    assert thumbnails.get_thumbnail(IMAGE_URL) is None
+
+def test_prune_cache_evicts_least_recently_used(cache_dir):
+    """Tests that pruning removes the oldest files until the cache fits the size cap."""
+    for i, name in enumerate(["old.jpg", "middle.jpg", "new.jpg"]):
+        path = cache_dir / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (i, i))
+
+    thumbnails.prune_cache(max_bytes=200)
+
+    assert sorted(path.name for path in cache_dir.iterdir()) == ["middle.jpg", "new.jpg"]
+
+def test_prune_cache_keeps_in_progress_writes(cache_dir):
+    """Tests that pruning never deletes another request's temporary file."""
+    tmp_file = cache_dir / "abc.1234.tmp"
+    tmp_file.write_bytes(b"x" * 100)
+    os.utime(tmp_file, (0, 0))
+
+    thumbnails.prune_cache(max_bytes=0)
+
+    assert tmp_file.exists()
+
+def test_cache_write_prunes_only_over_cap(cache_dir, fetches, monkeypatch):
+    """Tests that the running cache total triggers pruning once the cap is exceeded."""
+    pruned = []
+    monkeypatch.setattr(thumbnails, "prune_cache", lambda: pruned.append(True))
+    monkeypatch.setattr(thumbnails, "THUMBNAIL_CACHE_MAX_BYTES", 10 ** 9)
+
+    thumbnails.get_thumbnail(IMAGE_URL)
+    assert pruned == []
+
+    monkeypatch.setattr(thumbnails, "THUMBNAIL_CACHE_MAX_BYTES", 1)
+    thumbnails.get_thumbnail("https://example.com/other.png")
+    assert pruned == [True]
@@ -1,23 +1,65 @@
+import os
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # --- CONFIGURATION ---
 BACKEND_URL = "http://backend:8000" # URL of FastAPI backend
+# Backend URL as seen from the reader's browser. When set, images are loaded by the
+# browser directly so the backend's long-lived Cache-Control headers apply.
+PUBLIC_BACKEND_URL = os.getenv("PUBLIC_BACKEND_URL")
 
 st.set_page_config(page_title="AI News Aggregator", layout="wide")
 
+PAGE_SIZE = 5 # Number of stories loaded per category at a time
+
 # --- HELPER FUNCTIONS ---
 @st.cache_data(ttl=600) # Cache data for 10 minutes
-def fetch_highlights():
-    """Fetches highlight data from the backend API."""
+def fetch_highlights(page=1, category=None):
+    """Fetches one page of highlight cards from the backend API."""
+    params = {"page": page, "page_size": PAGE_SIZE}
+    if category:
+        params["category"] = category
     try:
-        response = requests.get(f"{BACKEND_URL}/highlights")
+        response = requests.get(f"{BACKEND_URL}/highlights", params=params)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         st.error(f"Could not connect to the backend: {e}")
         return None
 
+# Failed requests raise instead of returning, so st.cache_data never caches an error
+@st.cache_data(ttl=3600) # Full text rarely changes, cache it for an hour
+def fetch_full_text(article_id):
+    """Fetches the full text of a single article from the backend API."""
+    response = requests.get(f"{BACKEND_URL}/articles/{article_id}")
+    response.raise_for_status()
+    return response.json().get("full_text")
+
+@st.cache_data(ttl=86400, max_entries=500) # Thumbnail URLs are versioned, cache them for a day
+def fetch_thumbnail(thumbnail_url):
+    """Fetches a resized thumbnail image from the backend's thumbnail cache."""
+    response = requests.get(f"{BACKEND_URL}{thumbnail_url}", timeout=15)
+    response.raise_for_status()
+    return response.content
+
+def fetch_thumbnail_or_none(thumbnail_url):
+    """Fetches a thumbnail, returning None instead of raising if it is unavailable."""
+    try:
+        return fetch_thumbnail(thumbnail_url)
+    except requests.exceptions.RequestException:
+        return None
+
+def fill_thumbnails(placeholders):
+    """Fetches thumbnails concurrently and draws each one into its placeholder as it arrives."""
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=8, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        futures = {executor.submit(fetch_thumbnail_or_none, url): placeholder for placeholder, url in placeholders}
+        for future in as_completed(futures):
+            if future.result():
+                futures[future].image(future.result())
+
 def ask_chatbot(question):
     """Sends a question to the chatbot backend and gets an answer."""
     try:
@@ -37,16 +79,32 @@ if highlights_data:
     capitalized_tabs = [cat.capitalize() for cat in highlights_data.keys()]
     category_tabs = st.tabs(capitalized_tabs)
 
-    for i, (category, articles) in enumerate(highlights_data.items()):
+    # Without a browser-reachable backend URL, thumbnails are proxied through Streamlit.
+    # Cards get an empty slot for their image and the images are filled in once all
+    # text is on screen, one category at a time.
+    thumbnail_placeholders = {category: [] for category in highlights_data}
+
+    for i, (category, first_page) in enumerate(highlights_data.items()):
         with category_tabs[i]:
-            if not articles:
+            if not first_page:
                 st.write(f"No recent articles found for {category}.")
                 continue
+
+            # Later pages are only requested once the reader asks for more stories
+            pages_key = f"pages_{category}"
+            pages_loaded = st.session_state.get(pages_key, 1)
+            articles = list(first_page)
+            for page in range(2, pages_loaded + 1):
+                page_data = fetch_highlights(page, category) or {}
+                articles.extend(page_data.get(category, []))
             
             for article in articles:
                 with st.container():
-                    if article.get("image_url"):
-                        st.image(article["image_url"])
+                    if article.get("thumbnail_url"):
+                        if PUBLIC_BACKEND_URL:
+                            st.image(f"{PUBLIC_BACKEND_URL}{article['thumbnail_url']}")
+                        else:
+                            thumbnail_placeholders[category].append((st.empty(), article["thumbnail_url"]))
                     
                     st.subheader(article["title"])
                     
@@ -63,8 +121,21 @@ if highlights_data:
                     
                     st.write(article.get("summary", "No summary available."))
                     
+                    # Streamlit runs expander bodies even when collapsed, so the
+                    # full text is only requested after the reader clicks for it
                     with st.expander("Show Full Text"):
-                        st.write(article.get("full_text", "No full text available."))
+                        text_key = f"full_text_{article['_id']}"
+                        if st.session_state.get(text_key) or st.button("Load full text", key=f"load_{article['_id']}"):
+                            st.session_state[text_key] = True
+                            try:
+                                st.write(fetch_full_text(article["_id"]) or "No full text available.")
+                            except requests.exceptions.RequestException:
+                                st.warning("Could not load the full text right now. Please try again.")
+
+            if len(articles) == pages_loaded * PAGE_SIZE:
+                if st.button("Load more stories", key=f"more_{category}"):
+                    st.session_state[pages_key] = pages_loaded + 1
+                    st.rerun()
 
 # --- CHATBOT INTERFACE ---
 st.sidebar.header("Chat with the News")
@@ -77,4 +148,9 @@ if st.sidebar.button("Ask", key="ask_button"):
                 answer = ask_chatbot(user_question)
                 st.info(answer)
     else:
-        st.sidebar.warning("Please enter a question.")
\ No newline at end of file
+        st.sidebar.warning("Please enter a question.")
+
+# --- DEFERRED THUMBNAILS ---
+if highlights_data:
+    for placeholders in thumbnail_placeholders.values():
+        fill_thumbnails(placeholders)